@@ -1,7 +1,19 @@
+import base64
+import math
+
 import streamlit as st
-import pandas as pd
+import numpy as np
 import plotly.express as px
 
+from data_io import load_bf2, per_day_stats
+from ui_config import (
+    FIG_LAYOUT,
+    PAGE_SIZE,
+    PLOTLY_CONFIG,
+    TABLE_COLUMN_CONFIG,
+    WEBGL_POINT_THRESHOLD
+)
+
 # ---------------- PAGE CONFIG ----------------
 st.set_page_config(
     page_title="Blast Furnace-2 Dashboard",
@@ -9,7 +21,7 @@ st.set_page_config(
 )
 
 # ---------------- CSS ----------------
-st.markdown("""
+CSS_BLOCK = """
 <style>
 html, body, [class*="css"] {
     background-color: white;
@@ -36,6 +48,16 @@ html, body, [class*="css"] {
     background-color: #F57C00;
     margin: 8px auto 18px auto;
 }
+.kpi-grid {
+    display: grid;
+    grid-template-columns: repeat(4, 1fr);
+    gap: 16px;
+}
+@media (max-width: 640px) {
+    .kpi-grid {
+        grid-template-columns: repeat(2, 1fr);
+    }
+}
 .kpi-card {
     background: linear-gradient(135deg, #0D1B2A, #1B2A41);
     color: white;
@@ -52,59 +74,39 @@ html, body, [class*="css"] {
     color: #F57C00;
 }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+TITLE_HTML = (
+    "<h2 class='main-title'>Blast Furnace-2 | Ladle Weight & Dispatch Dashboard</h2>"
+    "<div class='title-line'></div>"
+    "<div class='subtitle'>Hot Metal Production Monitoring</div>"
+)
+
+
+# Read and encode the logo once per process instead of re-registering the PNG every rerun
+@st.cache_resource
+def logo_html(path, width):
+    with open(path, "rb") as f:
+        encoded = base64.b64encode(f.read()).decode()
+    return f"<img src='data:image/png;base64,{encoded}' width='{width}'>"
+
+
+# Streamlit drops any element a rerun doesn't emit, so the style block is re-sent every run
+st.markdown(CSS_BLOCK, unsafe_allow_html=True)
 
 # ---------------- HEADER ----------------
 st.markdown("<div class='top-bar'></div>", unsafe_allow_html=True)
 
 h1, h2, h3 = st.columns([1, 6, 1])
 with h1:
-    st.image("assets/jindal_logo.png", width=110)
+    st.markdown(logo_html("assets/jindal_logo.png", 110), unsafe_allow_html=True)
 with h2:
-    st.markdown("<h2 class='main-title'>Blast Furnace-2 | Ladle Weight & Dispatch Dashboard</h2>", unsafe_allow_html=True)
-    st.markdown("<div class='title-line'></div>", unsafe_allow_html=True)
-    st.markdown("<div class='subtitle'>Hot Metal Production Monitoring</div>", unsafe_allow_html=True)
+    st.markdown(TITLE_HTML, unsafe_allow_html=True)
 
 st.markdown("---")
 
 # ---------------- DATA LOADER ----------------
-@st.cache_data
-def load_data():
-    df = pd.read_excel("data/ladle_weight_bf2.xlsx")
-    df.columns = df.columns.str.strip().str.upper()
-
-    def find_col(key):
-        for c in df.columns:
-            if key in c:
-                return c
-        return None
-
-    cols = {
-        "Date": find_col("DATE"),
-        "Cast ID": find_col("CAST"),
-        "Torpedo No": find_col("TORPEDO"),
-        "Gross (t)": find_col("GROSS"),
-        "Tare (t)": find_col("TARE"),
-        "Net (t)": find_col("NET")
-    }
-
-    clean = pd.DataFrame()
-    for k, v in cols.items():
-        if v is None:
-            st.error(f"Missing column in Excel: {k}")
-            st.stop()
-        clean[k] = df[v]
-
-    clean["Date"] = pd.to_datetime(clean["Date"], errors="coerce")
-
-    for col in ["Gross (t)", "Tare (t)", "Net (t)"]:
-        clean[col] = pd.to_numeric(clean[col], errors="coerce")
-
-    clean["Torpedo No"] = clean["Torpedo No"].astype("Int64").astype(str)
-
-    return clean.dropna(subset=["Date"])
-
-df = load_data()
+df, torpedo_options, date_min, date_max, data_version = load_bf2()
 
 # ---------------- DATE SELECTION ----------------
 st.subheader("Date Selection")
@@ -116,16 +118,16 @@ mode = st.radio(
 )
 
 if mode == "Single Day":
-    selected_date = st.date_input("Select Date", df["Date"].min())
-    start_date = pd.to_datetime(selected_date)
+    selected_date = st.date_input("Select Date", date_min)
+    start_date = np.datetime64(selected_date, "ns")
     end_date = start_date
 else:
     date_range = st.date_input(
         "Select Date Range",
-        [df["Date"].min(), df["Date"].max()]
+        [date_min, date_max]
     )
-    start_date = pd.to_datetime(date_range[0])
-    end_date = pd.to_datetime(date_range[1])
+    start_date = np.datetime64(date_range[0], "ns")
+    end_date = np.datetime64(date_range[1], "ns")
 
 # ---------------- FILTERS ----------------
 f1, f2 = st.columns(2)
@@ -133,78 +135,147 @@ f1, f2 = st.columns(2)
 with f1:
     torpedo_filter = st.multiselect(
         "Torpedo No",
-        sorted(df["Torpedo No"].unique())
+        torpedo_options
     )
 
 with f2:
     cast_search = st.text_input("Cast ID")
 
-filtered = df[
-    (df["Date"] >= start_date) &
-    (df["Date"] <= end_date)
-]
 
-if filtered.empty:
-    st.warning("No data available for the selected date(s)")
-    st.stop()
+# Keyed on the filter widgets plus the data version; the leading underscore keeps
+# Streamlit from hashing the whole frame on every rerun
+@st.cache_data(show_spinner=False)
+def apply_filters(_df, data_version, lo, hi, torps, needle):
+    filtered = _df.iloc[lo:hi]
+
+    # Torpedo and cast predicates share one mask so the matching rows are taken only once
+    if torps or needle:
+        mask = np.ones(len(filtered), dtype=bool)
+        if torps:
+            mask &= filtered["Torpedo No"].isin(torps).to_numpy()
+        if needle:
+            mask &= filtered["Cast ID"].str.contains(
+                needle, case=False, regex=False, na=False
+            ).to_numpy(dtype=bool)
+        filtered = filtered[mask]
+
+    # Left index restarts at 1 for every day
+    if per_day_stats is not None:
+        sno, net_total, net_count = per_day_stats(
+            filtered["_DateKey"].to_numpy().view("int64"),
+            filtered["Net (t)"].to_numpy(dtype="float64")
+        )
+        filtered.index = sno
+    else:
+        filtered.index = filtered.groupby("_DateKey", sort=False).cumcount().to_numpy() + 1
+        net_total = filtered["Net (t)"].sum()
+        net_count = filtered["Net (t)"].count()
+
+    # Aggregate before plotting so each chart ships one bar per day / torpedo, not one per row
+    daily_df = (
+        filtered.groupby("_DateKey", as_index=False, sort=False)["Net (t)"].sum()
+        .rename(columns={"_DateKey": "Date"})
+    )
+    # Gross is Tare + Net, so it is shown as the stacked total rather than its own trace
+    stack_df = filtered.groupby("Torpedo No", as_index=False, observed=True)[
+        ["Tare (t)", "Net (t)"]
+    ].sum()
+
+    kpis = {
+        "casts": filtered["Cast ID"].nunique(),
+        "torpedos": len(stack_df),
+        "net_total": net_total,
+        "net_mean": net_total / net_count if net_count else float("nan")
+    }
 
-if torpedo_filter:
-    filtered = filtered[filtered["Torpedo No"].isin(torpedo_filter)]
+    return filtered, kpis, daily_df, stack_df
 
-if cast_search:
-    filtered = filtered[
-        filtered["Cast ID"].astype(str).str.contains(cast_search, case=False)
-    ]
 
-# ---------------- RESET LEFT INDEX PER DAY ----------------
-filtered = (
-    filtered
-    .sort_values("Date")
-    .groupby(filtered["Date"].dt.date, group_keys=False)
-    .apply(lambda x: x.reset_index(drop=True))
-)
+date_arr = df["Date"].to_numpy()
+lo = np.searchsorted(date_arr, start_date, side="left")
+hi = np.searchsorted(date_arr, end_date, side="right")
 
-filtered.index = filtered.index + 1
+if lo == hi:
+    st.warning("No data available for the selected date(s)")
+    st.stop()
 
-# ---------------- KPIs ----------------
-k1, k2, k3, k4 = st.columns(4)
+filtered, kpis, daily_df, stack_df = apply_filters(
+    df, data_version, int(lo), int(hi), tuple(torpedo_filter), cast_search.lower()
+)
 
-k1.markdown(f"<div class='kpi-card'>Total Casts<div class='kpi-value'>{filtered['Cast ID'].nunique()}</div></div>", unsafe_allow_html=True)
-k2.markdown(f"<div class='kpi-card'>Torpedos Used<div class='kpi-value'>{filtered['Torpedo No'].nunique()}</div></div>", unsafe_allow_html=True)
-k3.markdown(f"<div class='kpi-card'>Total Net Hot Metal<div class='kpi-value net-highlight'>{filtered['Net (t)'].sum():,.1f} t</div></div>", unsafe_allow_html=True)
-k4.markdown(f"<div class='kpi-card'>Avg Net / Cast<div class='kpi-value'>{filtered['Net (t)'].mean():.1f} t</div></div>", unsafe_allow_html=True)
+# ---------------- KPIs ----------------
+# All four cards go out as one element instead of four column blocks
+st.markdown(
+    "<div class='kpi-grid'>"
+    f"<div class='kpi-card'>Total Casts<div class='kpi-value'>{kpis['casts']}</div></div>"
+    f"<div class='kpi-card'>Torpedos Used<div class='kpi-value'>{kpis['torpedos']}</div></div>"
+    f"<div class='kpi-card'>Total Net Hot Metal<div class='kpi-value net-highlight'>{kpis['net_total']:,.1f} t</div></div>"
+    f"<div class='kpi-card'>Avg Net / Cast<div class='kpi-value'>{kpis['net_mean']:.1f} t</div></div>"
+    "</div>",
+    unsafe_allow_html=True
+)
 
 # ---------------- TABLE (STABLE) ----------------
 st.markdown("### Torpedo Dispatch Details")
 
-display_df = filtered.copy()
-display_df["Date"] = display_df["Date"].dt.date
+page_count = max(1, math.ceil(len(filtered) / PAGE_SIZE))
+page = 1
+if page_count > 1:
+    page = st.number_input("Page", min_value=1, max_value=page_count, value=1, step=1)
+    st.caption(f"Page {page} of {page_count} · {len(filtered)} rows")
 
-display_df = display_df[
+page_df = filtered.iloc[(page - 1) * PAGE_SIZE:page * PAGE_SIZE]
+
+# Date stays datetime64 (DateColumn shows the day) so no Python date objects are built
+display_df = page_df[
     ["Date", "Cast ID", "Torpedo No", "Gross (t)", "Tare (t)", "Net (t)"]
 ]
 
-st.dataframe(display_df, use_container_width=True)
+st.dataframe(
+    display_df,
+    use_container_width=True,
+    column_config=TABLE_COLUMN_CONFIG
+)
 
 # ---------------- CHARTS ----------------
-c1, c2, c3 = st.columns(3)
-
-c1.plotly_chart(px.bar(filtered, x="Date", y="Net (t)", title="Daily Net Hot Metal (t)",
-                       color_discrete_sequence=["#F57C00"]), use_container_width=True)
+# Figures are cached on the aggregated frames, so reruns with unchanged filters skip px.bar.
+# uirevision follows the filter state: zoom / pan survive unrelated reruns but reset when
+# the filters change the data.
+@st.cache_data(show_spinner=False)
+def make_daily_fig(daily_df, view_key):
+    if len(daily_df) > WEBGL_POINT_THRESHOLD:
+        fig = px.scatter(daily_df, x="Date", y="Net (t)", title="Daily Net Hot Metal (t)",
+                         color_discrete_sequence=["#F57C00"], render_mode="webgl")
+    else:
+        fig = px.bar(daily_df, x="Date", y="Net (t)", title="Daily Net Hot Metal (t)",
+                     color_discrete_sequence=["#F57C00"])
+    return fig.update_layout(uirevision=view_key, **FIG_LAYOUT)
+
+
+@st.cache_data(show_spinner=False)
+def make_torpedo_fig(stack_df, view_key):
+    fig = px.bar(stack_df, x="Torpedo No", y="Net (t)", title="Torpedo vs Net Metal (t)",
+                 color_discrete_sequence=["#F57C00"])
+    return fig.update_layout(uirevision=view_key, **FIG_LAYOUT)
+
+
+@st.cache_data(show_spinner=False)
+def make_stack_fig(stack_df, view_key):
+    fig = px.bar(stack_df, x="Torpedo No",
+                 y=["Tare (t)", "Net (t)"],
+                 title="Gross Weight = Tare + Net (t)",
+                 barmode="stack",
+                 color_discrete_sequence=["#2E3440", "#D32F2F"])
+    return fig.update_layout(uirevision=view_key, **FIG_LAYOUT)
+
+
+view_key = f"{lo}:{hi}:{tuple(torpedo_filter)}:{cast_search.lower()}"
 
-c2.plotly_chart(px.bar(filtered, x="Torpedo No", y="Net (t)", title="Torpedo vs Net Metal (t)",
-                       color_discrete_sequence=["#F57C00"]), use_container_width=True)
-
-stack_df = filtered.groupby("Torpedo No", as_index=False)[
-    ["Gross (t)", "Tare (t)", "Net (t)"]
-].sum()
+c1, c2, c3 = st.columns(3)
 
-c3.plotly_chart(px.bar(stack_df, x="Torpedo No",
-                       y=["Gross (t)", "Tare (t)", "Net (t)"],
-                       title="Gross, Tare & Net Weight (t)",
-                       barmode="stack",
-                       color_discrete_sequence=["#F57C00", "#2E3440", "#D32F2F"]),
-                use_container_width=True)
+c1.plotly_chart(make_daily_fig(daily_df, view_key), use_container_width=True, config=PLOTLY_CONFIG)
+c2.plotly_chart(make_torpedo_fig(stack_df, view_key), use_container_width=True, config=PLOTLY_CONFIG)
+c3.plotly_chart(make_stack_fig(stack_df, view_key), use_container_width=True, config=PLOTLY_CONFIG)
 
 # ---------------- FOOTER ----------------
 st.markdown("---")
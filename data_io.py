@@ -0,0 +1,184 @@
+import glob
+import hashlib
+import os
+import tempfile
+from typing import NamedTuple
+
+import streamlit as st
+import numpy as np
+import pandas as pd
+
+try:
+    from numba import njit
+except ImportError:
+    # numba is optional; without it the dashboard uses its pandas groupby path
+    njit = None
+
+DATA_PATH = "data/ladle_weight_bf2.xlsx"
+CACHE_DIR = ".cache"
+# Bump whenever the normalized frame layout changes so old Parquet caches are ignored
+CACHE_VERSION = 8
+
+try:
+    import python_calamine  # noqa: F401
+    EXCEL_ENGINE = "calamine"
+except ImportError:
+    # pandas' openpyxl reader already opens the workbook read-only / data-only
+    EXCEL_ENGINE = "openpyxl"
+
+# Dashboard column -> tag looked for in the normalized Excel header
+COLUMN_TAGS = {
+    "Date": "DATE",
+    "Cast ID": "CAST",
+    "Torpedo No": "TORPEDO",
+    "Gross (t)": "GROSS",
+    "Tare (t)": "TARE",
+    "Net (t)": "NET"
+}
+
+
+def cache_prefix(xlsx_path):
+    stem, _ = os.path.splitext(os.path.basename(xlsx_path))
+    return os.path.join(CACHE_DIR, stem)
+
+
+def workbook_digest(xlsx_path):
+    # Content hash rather than mtime: a fresh checkout or container restart resets mtimes
+    # but keeps the digest, while any edit to the sheet changes it
+    with open(xlsx_path, "rb") as f:
+        return hashlib.md5(f.read()).hexdigest()
+
+
+def parquet_cache_path(xlsx_path, digest):
+    return f"{cache_prefix(xlsx_path)}.v{CACHE_VERSION}.{digest}.parquet"
+
+
+def find_columns(header):
+    # One pass over the header; the first column carrying each tag wins
+    cols = {}
+    for c in header:
+        name = str(c).strip().upper()
+        for k, tag in COLUMN_TAGS.items():
+            if k not in cols and tag in name:
+                cols[k] = c
+    return cols
+
+
+def read_ladle_frame(digest):
+    cache_path = parquet_cache_path(DATA_PATH, digest)
+    if os.path.exists(cache_path):
+        try:
+            return pd.read_parquet(cache_path)
+        except Exception:
+            # A truncated or corrupt cache would otherwise fail every start; rebuild it
+            try:
+                os.remove(cache_path)
+            except OSError:
+                pass
+
+    # Resolve columns from the header row first so the full read comes back typed
+    header = pd.read_excel(DATA_PATH, engine=EXCEL_ENGINE, sheet_name=0, nrows=0).columns
+
+    cols = find_columns(header)
+
+    for k in COLUMN_TAGS:
+        if k not in cols:
+            st.error(f"Missing column in Excel: {k}")
+            st.stop()
+
+    clean = pd.read_excel(
+        DATA_PATH,
+        engine=EXCEL_ENGINE,
+        sheet_name=0,
+        # Only the dashboard columns are parsed; the rest of the sheet is skipped
+        usecols=list(cols.values()),
+        dtype={cols["Cast ID"]: "string", cols["Torpedo No"]: "Int64"}
+    )
+
+    # usecols already narrowed the frame, so the headers are just renamed in place
+    clean.rename(columns={v: k for k, v in cols.items()}, inplace=True)
+
+    # Like Gross / Tare, DATE is hand-kept and may hold free text; coerce it to NaT so the row is dropped
+    clean["Date"] = pd.to_datetime(clean["Date"], errors="coerce")
+
+    # Gross / Tare hold free-text entries such as "DUMP PIT", so they can't be typed at read time.
+    # float32 is plenty for ladle weights in tonnes and halves the bytes summed / serialized.
+    for col in ["Gross (t)", "Tare (t)", "Net (t)"]:
+        clean[col] = pd.to_numeric(clean[col], errors="coerce").astype("float32")
+
+    # Sorted by Date so the date filter can binary-search instead of scanning
+    clean = clean.dropna(subset=["Date"]).sort_values("Date", kind="stable").reset_index(drop=True)
+    # Only a handful of torpedoes: int codes make isin / nunique / groupby cheap
+    clean["Torpedo No"] = pd.Categorical(clean["Torpedo No"].astype("string"))
+    # Day-resolution datetime64 key: a cheap int64 view instead of Python date objects
+    clean["_DateKey"] = clean["Date"].values.astype("datetime64[D]")
+
+    # Drop caches left behind by older versions of the workbook
+    for stale in glob.glob(f"{cache_prefix(DATA_PATH)}.*.parquet"):
+        try:
+            os.remove(stale)
+        except OSError:
+            pass
+
+    # Write to a temp file and rename it into place, so an interrupted or concurrent
+    # write can never leave a partial file under the final cache name
+    tmp_path = None
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, suffix=".parquet.tmp")
+        os.close(fd)
+        clean.to_parquet(tmp_path, compression="zstd")
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        # Read-only deployments just skip the on-disk cache
+        if tmp_path is not None:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+    return clean
+
+
+class LadleData(NamedTuple):
+    df: pd.DataFrame
+    torpedo_options: list
+    date_min: pd.Timestamp
+    date_max: pd.Timestamp
+    # Workbook digest, so downstream caches can key on the data without hashing the frame
+    version: str
+
+
+# Shared by every page: one memoized frame per process instead of one per page
+@st.cache_data
+def load_bf2():
+    digest = workbook_digest(DATA_PATH)
+    clean = read_ladle_frame(digest)
+    # Arrow-backed strings go to st.dataframe / Plotly without an object round trip, and the
+    # case-insensitive Cast ID search runs as an Arrow kernel. Set here rather than in the
+    # Parquet cache, which restores the default string storage.
+    clean["Cast ID"] = clean["Cast ID"].astype("string[pyarrow]")
+    torpedo_options = clean["Torpedo No"].cat.categories.tolist()
+    return LadleData(clean, torpedo_options, clean["Date"].min(), clean["Date"].max(), digest)
+
+
+def per_day_stats(date_key, net):
+    # One linear pass over the date-sorted rows: per-day serial plus Net sum / count
+    sno = np.empty(date_key.shape[0], dtype=np.int32)
+    net_sum = 0.0
+    net_count = 0
+    run = 0
+    for i in range(date_key.shape[0]):
+        if i == 0 or date_key[i] != date_key[i - 1]:
+            run = 0
+        run += 1
+        sno[i] = run
+        if not np.isnan(net[i]):
+            net_sum += net[i]
+            net_count += 1
+    return sno, net_sum, net_count
+
+
+# Defined here rather than in the page script so numba compiles it once per process,
+# not on every Streamlit rerun. None when numba is missing: callers use pandas instead.
+per_day_stats = njit(cache=True)(per_day_stats) if njit is not None else None
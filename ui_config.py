@@ -0,0 +1,22 @@
+import streamlit as st
+
+# Display constants live in an imported module: app.py is re-executed top to bottom on
+# every rerun, while this module is built once per process.
+
+# ---------------- TABLE ----------------
+# Only one page of rows is shipped to the browser per rerun
+PAGE_SIZE = 100
+# Formatting happens client-side on the Arrow batch; no Styler / per-cell Python
+TABLE_COLUMN_CONFIG = {
+    "Date": st.column_config.DateColumn(format="YYYY-MM-DD"),
+    **{
+        col: st.column_config.NumberColumn(format="%.1f")
+        for col in ["Gross (t)", "Tare (t)", "Net (t)"]
+    }
+}
+
+# ---------------- CHARTS ----------------
+PLOTLY_CONFIG = {"displaylogo": False, "displayModeBar": False, "responsive": True}
+FIG_LAYOUT = {"transition_duration": 0}
+# Past this many days the daily chart switches from SVG bars to WebGL markers
+WEBGL_POINT_THRESHOLD = 2000